@@ -1,21 +1,20 @@
 import os
 import sys
-import json
 from pathlib import Path
 import asyncio
 import platform
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from argparse import Namespace
 
 import edge_tts
+import orjson
 import streamlit as st
 import pandas as pd
 
-from src.video_creator import VideoCreator
+from src.video_creator import VideoCreator, load_whisper
 from utils import rgb_to_bgr
 
-# Import the function for merging audio and video
-from src.audio_processing.merge_audio_video import merge_video_and_audio
-
 from src.create_video_json import process_images
 
 import tempfile
@@ -43,6 +42,7 @@ async def generate_video(
         mixing_percentage, 
         use_images,  # New argument for using images
         selected_image_paths,  # New argument for selected image paths
+        faster_whisper,
         *args,
         **kwargs):
 
@@ -55,12 +55,16 @@ async def generate_video(
         sub_position=sub_position,
         url=url,
         non_english=non_english,
+        faster_whisper=faster_whisper,
         upload_tiktok=upload_tiktok,
         verbose=verbose,
         mp4_background=background_tab,
         max_words=max_words
     )
 
+    # Load the Whisper model once, in the background, and share it between all the videos
+    model_task = asyncio.create_task(asyncio.to_thread(load_whisper, model, non_english, faster_whisper))
+
     async def get_video(video_data, args, add_audio):  # Pass checkbox state to function
         with st.status("Generating video...", expanded=False) as status:
             video_creator = VideoCreator(video_data, args)
@@ -77,40 +81,44 @@ async def generate_video(
 
                     # Process images in the temporary directory
                     status.update(label="Processing images...")
-                    process_images(temp_dir_path)
-
-            status.update(label="Downloading video...")
-            video_creator.download_video()
-
-            status.update(label="Loading model...")
-            video_creator.load_model()
+                    await asyncio.to_thread(process_images, temp_dir_path)
 
             status.update(label="Creating text...")
             video_creator.create_text()
 
-            status.update(label="Generating audio...")
-            await video_creator.text_to_speech()
+            # Blocking steps run in worker threads so the other videos keep progressing
+            # Download the background and generate the audio concurrently
+            async def stage(coro, label):
+                await coro
+                return label
+
+            status.update(label="Downloading video and generating audio...")
+            stages = [
+                stage(asyncio.to_thread(video_creator.download_video), "Video downloaded"),
+                stage(video_creator.text_to_speech(), "Audio generated"),
+            ]
+            for finished in asyncio.as_completed(stages):
+                status.update(label=await finished)
+
+            status.update(label="Loading model...")
+            video_creator.model, video_creator.model_lock = await model_task
 
             status.update(label="Generating transcription...")
-            video_creator.generate_transcription()
+            await asyncio.to_thread(video_creator.generate_transcription)
 
             status.update(label="Selecting background...")
-            video_creator.select_background()
+            await asyncio.to_thread(video_creator.select_background)
 
             status.update(label="Integrating subtitles...")
-            video_creator.integrate_subtitles()
-
-            # Check if "Add Audio?" checkbox is checked
+            # Mix the uploaded audio in while rendering if "Add Audio?" is checked
             if add_audio:
-                # Merge video with uploaded audio using the original video file name
-                merge_video_and_audio(str(video_creator.mp4_final_video), selected_audio_path, str(video_creator.mp4_final_video), mixing_percentage)
-
-                # Delete the temporary audio file after merging
-                os.remove(selected_audio_path)
+                await asyncio.to_thread(video_creator.integrate_subtitles, extra_audio=selected_audio_path, mix=mixing_percentage)
+            else:
+                await asyncio.to_thread(video_creator.integrate_subtitles)
 
             if upload_tiktok:
                 status.update(label="Uploading to TikTok...")
-                video_creator.upload_to_tiktok()
+                await asyncio.to_thread(video_creator.upload_to_tiktok)
 
             status.update(label="Video generated!",
                           state="complete", expanded=False)
@@ -118,7 +126,23 @@ async def generate_video(
 
     tasks = [get_video(video_json[i], args, add_audio)  # Pass checkbox state to function
              for i, name in enumerate(video_num)]
-    results = await asyncio.gather(*tasks)
+    try:
+        if sys.version_info >= (3, 11):
+            # Cancel the remaining videos as soon as one of them fails
+            async with asyncio.TaskGroup() as task_group:
+                running = [task_group.create_task(task) for task in tasks]
+            results = [task.result() for task in running]
+        else:
+            results = await asyncio.gather(*tasks)
+    finally:
+        # Delete the temporary audio file once every video has been rendered. After a
+        # failure, a cancelled video's ffmpeg thread may still hold it open (Windows
+        # refuses the removal), which must not hide the original error
+        if add_audio:
+            try:
+                os.remove(selected_audio_path)
+            except OSError:
+                pass
 
     if len(results) == 1:
         return results[0]
@@ -127,29 +151,56 @@ async def generate_video(
         return results[-1]
 
 
+@st.cache_data(ttl=3600)
+def list_voice_labels():
+    # main() already runs inside an event loop, so fetch the voices on a worker thread
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        voices = executor.submit(asyncio.run, edge_tts.list_voices()).result()
+
+    # Build the selectbox labels once per refresh instead of on every rerun,
+    # only the labels are cached so reruns don't unpickle every voice dict
+    return [f"{i['ShortName']} | {i['Gender']} | Tags: {i['VoiceTag']['VoicePersonalities']}" for i in voices]
+
+
+@st.cache_data
+def load_videos(mtime):
+    # mtime is only used as the cache key so edits to video.json are picked up
+    return orjson.loads(Path('video.json').read_bytes())
+
+
 @st.cache_data
-def json_to_df(json_file):
+def list_backgrounds(mtime):
+    # mtime is only used as the cache key so new backgrounds are picked up
+    if mtime is None:
+        return []
+    with os.scandir("background") as entries:
+        return [entry.name for entry in entries if entry.is_file() and entry.name.endswith('.mp4')]
+
+
+@st.cache_resource(max_entries=1)
+def json_to_df(json_file, mtime):
+    # Read-only for the editor, so share the DataFrame instead of unpickling a copy per rerun
     return pd.read_json(json_file)
 
 
 @st.cache_data
 def df_to_json(df):
     try:
-        # Convert the DataFrame to a JSON string
-        json_str = df.to_json(orient='records', indent=4, force_ascii=False)
+        # Convert the DataFrame to JSON bytes
+        json_bytes = orjson.dumps(df.to_dict(orient='records'),
+                                  option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
 
         # raise an error if the dataframe has no rows (at least one is required)
         if df.shape[0] == 0:
             st.error("You must add at least one video to the JSON")
             return
 
-        # Save the JSON string to a file
-        with open('video.json', 'w', encoding='UTF-8') as f:
-            f.write(json_str)
+        # Save the JSON bytes to a file
+        Path('video.json').write_bytes(json_bytes)
 
         st.success("JSON saved successfully!")
 
-    except ValueError as e:
+    except (ValueError, orjson.JSONEncodeError) as e:
         st.error("You must fill all the fields in the JSON")
     except Exception as e:
         st.error(f"Error saving JSON: {e}")
@@ -193,6 +244,9 @@ async def main():
         model = st.selectbox(
             "Whisper Model", ["tiny", "base", "small", "medium", "large"], index=4, help="The model used to generate the subtitles. The bigger the model, the better the results, but the slower the generation. The tiny model is recommended for testing purposes. Medium model is enough for good results in many languages.")
 
+        faster_whisper = st.checkbox(
+            "Faster Whisper", help="Use the faster-whisper (CTranslate2) backend with int8 quantized weights. It is several times faster and uses less memory, with nearly the same accuracy.")
+
         # Add checkbox for using images
         use_images = st.checkbox("Use Images?", help="Check this box if you want to include images in your video")
 
@@ -212,7 +266,7 @@ async def main():
         
         st.subheader("JSON Editor", help="Here you can edit the JSON file with the videos. Copy-and-paste is supported and compatible with Google Sheets, Excel, and others. You can do bulk-editing by dragging the handle on a cell (similar to Excel)!")
         st.write("ℹ️ The JSON file is saved automatically when you click the button below. Every time you edit the JSON file, you must click the button to save the changes otherwise they will be lost.")
-        edited_df = st.data_editor(json_to_df('video.json'),
+        edited_df = st.data_editor(json_to_df('video.json', Path('video.json').stat().st_mtime),
                                 num_rows="dynamic")
         st.button("Save JSON", on_click=df_to_json, args=(
             edited_df,), help="Save the JSON file with the videos")
@@ -225,7 +279,7 @@ async def main():
         st.subheader("General settings")
         tts_voice = st.selectbox(
             "TTS Voice",
-            [f"{i['ShortName']} | {i['Gender']} | Tags: {i['VoiceTag']['VoicePersonalities']}" for i in await edge_tts.list_voices()], index=113, help="The voice used to generate the audio. The voice must be in the same language as the subtitles."
+            list_voice_labels(), index=113, help="The voice used to generate the audio. The voice must be in the same language as the subtitles."
         )
 
         left, mid, right = st.columns(3)
@@ -278,21 +332,18 @@ async def main():
         st.subheader("Video settings")
 
         st.write("JSON file with the videos")
-        with open('video.json', encoding='utf-8') as fh:
-            video_json = st.json(json.load(fh), expanded=False)
+        videos = load_videos(Path('video.json').stat().st_mtime)
+        video_json = st.json(videos, expanded=False)
 
         # Get the list of files in "background"
         folder_path = Path("background").absolute()
-        files = folder_path.glob('*.mp4')
-        files = [file.name for file in files]
+        files = list_backgrounds(folder_path.stat().st_mtime if folder_path.exists() else None)
 
         # Create a Dropdown with the list of files
         background_tab = st.selectbox(
             "Your Backgrounds", files, index=0, help="The background video to use for the TikTok video")
 
         # Choose which video to generate
-        videos = json.load(open("video.json"))
-
         video_num = st.multiselect(
             "Video",
             options=videos,
@@ -317,11 +368,12 @@ async def main():
                 global result
                 selected_audio_path = None
                 if add_audio and selected_audio:
-                    with open("temp_audio_file.wav", "wb") as audio_file:
-                        audio_file.write(selected_audio.read())
-                    selected_audio_path = "temp_audio_file.wav"
+                    # Stream the upload to a unique temporary file so concurrent runs don't clobber each other
+                    with tempfile.NamedTemporaryFile(delete=False, suffix=Path(selected_audio.name).suffix) as audio_file:
+                        shutil.copyfileobj(selected_audio, audio_file, length=1024*1024)
+                    selected_audio_path = audio_file.name
                 result = await generate_video(model, tts_voice, sub_position, font, font_color, font_size,
-                                            url, non_english, upload_tiktok, verbose, videos, background_tab, video_num, max_words, add_audio, selected_audio_path, mixing_percentage, use_images, selected_images_path)
+                                            url, non_english, upload_tiktok, verbose, videos, background_tab, video_num, max_words, add_audio, selected_audio_path, mixing_percentage, use_images, selected_images_path, faster_whisper)
         else:
             st.button("Generate Video", disabled=True)
 
@@ -1,6 +1,6 @@
 # utils.py
 import asyncio
-import json
+import orjson
 import platform
 from dotenv import find_dotenv, load_dotenv
 from utils import *
@@ -25,7 +25,7 @@ logger = setup_logger()
 
 # JSON video file
 video_json_path = HOME / 'video.json'
-jsonData = json.loads(video_json_path.read_text(encoding='utf-8'))
+jsonData = orjson.loads(video_json_path.read_bytes())
 
 
 #######################
@@ -14,6 +14,8 @@ async def parse_args():
                         choices=["tiny", "base", "small", "medium", "large"], type=str)
     parser.add_argument("--non_english", action='store_true',
                         help="Don't use the english model.")
+    parser.add_argument("--faster_whisper", action='store_true',
+                        help="Use the faster-whisper (CTranslate2, int8) backend for the Whisper model.")
     parser.add_argument("--url", metavar='U', default="https://www.youtube.com/watch?v=intRX7BRA90",
                         help="Youtube URL to download as background video.", type=str)
     parser.add_argument("--tts", default="en-US-ChristopherNeural",
@@ -1,23 +1,47 @@
+import threading
+
 import cv2
 import pytesseract
 
+# tesserocr binds libtesseract directly, avoiding a tesseract process and a temporary image per call
+try:
+    from PIL import Image
+    from tesserocr import PyTessBaseAPI, PSM
+except ImportError:
+    PyTessBaseAPI = None
+
+# PyTessBaseAPI instances are not thread-safe, keep one per thread
+_local = threading.local()
+
+
+def _tesserocr_api():
+    api = getattr(_local, 'api', None)
+    if api is None:
+        api = _local.api = PyTessBaseAPI(psm=PSM.AUTO)
+    return api
+
+
 def extract_text_from_image(image_path):
-    # Load the image using OpenCV
-    image = cv2.imread(image_path)
+    # Load the image using OpenCV, directly as grayscale
+    gray = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
 
     '''
     PREPROCESSING
     '''
-    img = cv2.resize(image, (0, 0), fx=2, fy=2)
-    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
     image = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)[1]
 
     '''
     TEXT EXTRACTION
     '''
 
+    if PyTessBaseAPI is not None:
+        # Use a persistent tesserocr instance to extract text from the image
+        api = _tesserocr_api()
+        api.SetImage(Image.fromarray(image))
+        return api.GetUTF8Text()
+
     # Use pytesseract to extract text from the image
     config = "--psm 3"
     extracted_text = pytesseract.image_to_string(image, config=config)
 
-    return extracted_text
\ No newline at end of file
+    return extracted_text
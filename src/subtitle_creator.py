@@ -2,6 +2,10 @@ import os
 from pathlib import Path
 import torch
 
+# Allow TF32 matmuls and let cuDNN pick the fastest kernels on Ampere and newer GPUs
+torch.backends.cuda.matmul.allow_tf32 = True
+torch.backends.cudnn.benchmark = True
+
 
 def srt_create(whisper_model, path: str, series: str, part: int, text: str, filename: str, **kwargs) -> bool:
     series = series.replace(' ', '_')
@@ -25,8 +29,24 @@ def srt_create(whisper_model, path: str, series: str, part: int, text: str, file
         'MarginR': '60',
     }
 
-    transcribe = whisper_model.transcribe(
-        filename, regroup=True, fp16=torch.cuda.is_available())
+    # Language of the spoken text, e.g. "en" for the en-US-ChristopherNeural voice
+    language = (kwargs.get('tts') or 'en').split('-')[0]
+
+    # No gradients are needed, skip the autograd bookkeeping
+    with torch.inference_mode():
+        transcribe = None
+        if text and hasattr(whisper_model, 'align'):
+            # The spoken text is known, so align it to the audio instead of decoding it.
+            # Alignment is aborted (None) when over 20% of the words end up with no duration
+            transcribe = whisper_model.align(filename, text, language=language, failure_threshold=0.2)
+
+        if transcribe is None:
+            if hasattr(whisper_model, 'transcribe_stable'):
+                # faster-whisper model, the precision is set by its compute_type
+                transcribe = whisper_model.transcribe_stable(filename, regroup=True)
+            else:
+                transcribe = whisper_model.transcribe(
+                    filename, regroup=True, fp16=torch.cuda.is_available())
 
     transcribe.split_by_gap(0.5).split_by_length(kwargs.get(
         'max_characters')).merge_by_gap(0.15, max_words=kwargs.get('max_words'))
@@ -2,40 +2,41 @@ import re
 import emoji
 from src.text_processing.profanity_filter import process_text
 
+# Pattern to match the series and part
+SERIES_PATTERN = re.compile(r'Confession #(\d+)')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+EMOJI_PATTERN = re.compile(r'(\u00ae|\u00a9)')
+
+# Single character replacements: drop the opening \u201c, turn the closing \u201d
+# into a full stop, normalise curly apostrophes and replace '|' with 'I'
+CHARACTER_TABLE = str.maketrans({
+    '\u201c': '',
+    '\u201d': '.',
+    '\u2019': "'",
+    '\u2018': "'",
+    '|': 'I',
+})
+
 def reformat_text(extracted_text):
     # Format text
-    # Define a pattern to match the series and part
-    pattern = r'Confession #(\d+)'
-    match = re.search(pattern, extracted_text)
+    match = SERIES_PATTERN.search(extracted_text)
 
     if match:
         # Extract the series and part
         series = "Confessions"
         part = match.group(1)
 
-        # Remove leading and trailing spaces
-        extracted_text = extracted_text.strip()
-
-        # Remove newlines and extra spaces
-        cleaned_text = ' '.join(extracted_text.split())
+        # Remove leading and trailing spaces, newlines and extra spaces
+        cleaned_text = WHITESPACE_PATTERN.sub(' ', extracted_text.strip())
 
         # converting emoji symbols to names
         converted_text = emoji.emojize(cleaned_text)
 
-        # Use regex to remove the \u201c in the beginning
-        cleaned_text = re.sub(r'(\u201c)', '', converted_text)
-
-        # Use regex to the final \u201d before the location into a full stop
-        cleaned_text = re.sub(r'(\u201d)', '.', cleaned_text)
-
-        # Use regex to the final \u201d before the location into a full stop
-        cleaned_text = re.sub(r'(\u2019|\u2018)', "'", cleaned_text)
-
-        # Use regex to the final \u201d before the location into a full stop
-        cleaned_text = re.sub(r'(\u00ae|\u00a9)', ', crying emoji', cleaned_text)
+        # Replace the quotes, apostrophes and '|' in a single pass
+        cleaned_text = converted_text.translate(CHARACTER_TABLE)
 
-        # Replace '|' with 'I'
-        cleaned_text = cleaned_text.replace('|', 'I')
+        # Use regex to turn the \u00ae and \u00a9 symbols into the crying emoji
+        cleaned_text = EMOJI_PATTERN.sub(', crying emoji', cleaned_text)
 
         # Filter profanity and perform word replacement
         cleaned_text = process_text(cleaned_text)
@@ -1,19 +1,61 @@
 import json
+import threading
 from pathlib import Path
 
 import stable_whisper as whisper
+import torch
 from .logger import setup_logger
 from .subtitle_creator import srt_create
 from .text_to_speech import tts
 from .tiktok import upload_tiktok
 from .video_prepare import prepare_background
-from .video_downloader import download_video as youtube_download
+from .video_downloader import download_video_once as youtube_download
 from utils import *
 
 HOME = Path.cwd()
 logger = setup_logger()
 media_folder = HOME / 'media'
 
+# The last loaded Whisper model and its lock, keyed by (model name, device, faster-whisper backend)
+_models = {}
+_models_lock = threading.Lock()
+
+
+def load_whisper(model: str, non_english: bool = False, faster_whisper: bool = False):
+    """
+    Loads a Whisper model together with the lock that serialises its use. The last
+    loaded model is reused, a different one replaces it.
+
+    Whisper keeps per-call state in hooks registered on the model itself, so
+    transcriptions sharing a model must not overlap.
+
+    Args:
+        model (str): The name of the Whisper model.
+        non_english (bool, optional): Use the multilingual model. Defaults to False.
+        faster_whisper (bool, optional): Use the faster-whisper (CTranslate2) backend. Defaults to False.
+
+    Returns:
+        tuple: The loaded model and its threading.Lock.
+    """
+    if model != "large" and not non_english:
+        model = model + ".en"
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+
+    with _models_lock:
+        if (model, device, faster_whisper) not in _models:
+            # Keep a single model resident, release the previous one before loading
+            _models.clear()
+            if device == "cuda":
+                torch.cuda.empty_cache()
+            if faster_whisper:
+                # CTranslate2 backend with int8 weights
+                compute_type = "int8_float16" if device == "cuda" else "int8"
+                whisper_model = whisper.load_faster_whisper(model, device=device, compute_type=compute_type)
+            else:
+                whisper_model = whisper.load_model(model, device=device)
+            _models[(model, device, faster_whisper)] = (whisper_model, threading.Lock())
+        return _models[(model, device, faster_whisper)]
+
 
 class VideoCreator:
     def __init__(self, video, args):
@@ -28,18 +70,20 @@ class VideoCreator:
         self.path = Path(media_folder).absolute()
 
     def download_video(self, folder='background'):
-        youtube_download(url=self.args.url, folder=folder)
+        # Every video of a run shares the background URL, so only the first call downloads it
+        if not youtube_download(url=self.args.url, folder=folder):
+            logger.info(f"Video from {self.args.url} already downloaded to {folder}")
+            return
         console.log(
             f"{msg.OK}Video downloaded from {self.args.url} to {folder}")
         logger.info(f"Video downloaded from {self.args.url} to {folder}")
 
     def load_model(self):
-        model = self.args.model
-        if self.args.model != "large" and not self.args.non_english:
-            model = self.args.model + ".en"
-        whisper_model = whisper.load_model(model)
+        whisper_model, model_lock = load_whisper(self.args.model, self.args.non_english,
+                                                 getattr(self.args, 'faster_whisper', False))
 
         self.model = whisper_model
+        self.model_lock = model_lock
         return whisper_model
 
     def create_text(self):
@@ -57,8 +101,10 @@ class VideoCreator:
         await tts(self.req_text, outfile=self.mp3_file, voice=self.args.tts, args=self.args)
 
     def generate_transcription(self):
-        ass_filename = srt_create(self.model,
-                                  self.path, self.series, self.part, self.text, self.mp3_file, **vars(self.args))
+        # The model may be shared with videos generated concurrently, transcribe one at a time
+        with self.model_lock:
+            ass_filename = srt_create(self.model,
+                                      self.path, self.series, self.part, self.req_text, self.mp3_file, **vars(self.args))
         ass_filename = Path(ass_filename).absolute()
 
         self.ass_file = ass_filename
@@ -69,9 +115,7 @@ class VideoCreator:
             # Background video selected with WebUI
             background_mp4 = self.args.mp4_background
 
-            with KeepDir() as keep_dir:
-                keep_dir.chdir("background")
-                background_mp4 = Path(background_mp4).absolute()
+            background_mp4 = Path("background", background_mp4).absolute()
         except AttributeError:
             # CLI execution
             background_mp4 = random_background()
@@ -81,12 +125,12 @@ class VideoCreator:
         self.mp4_background = background_mp4
         return background_mp4
 
-    def integrate_subtitles(self):
+    def integrate_subtitles(self, extra_audio=None, mix=0.3):
         series = self.series.replace(' ', '_')
         outfilename = f"{series}_{self.part}"
 
         final_video = prepare_background(
-            self.mp4_background, filename_mp3=self.mp3_file, filename_srt=self.ass_file, output_filename=outfilename, verbose=self.args.verbose)
+            self.mp4_background, filename_mp3=self.mp3_file, filename_srt=self.ass_file, output_filename=outfilename, verbose=self.args.verbose, extra_audio=extra_audio, mix=mix)
         final_video = Path(final_video).absolute()
 
         self.mp4_final_video = final_video
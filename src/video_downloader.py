@@ -1,25 +1,57 @@
 import subprocess
+import threading
 from pathlib import Path
 
 import msg
-from utils import KeepDir
 
 HOME = Path.cwd()
 
+# Downloaded files and per-URL locks, keyed by (url, folder)
+_downloaded = {}
+_download_locks = {}
+_download_locks_lock = threading.Lock()
 
-def download_video(url: str, folder: str = 'background'):
+
+def download_video(url: str, folder: str = 'background') -> Path:
     """
     Downloads a video from the given URL and saves it to the specified folder.
 
     Args:
         url (str): The URL of the video to download.
         folder (str, optional): The name of the folder to save the video in. Defaults to 'background'.
+
+    Returns:
+        Path: The path of the downloaded video.
     """
     directory = HOME / folder
     if not directory.exists():
         directory.mkdir()
 
-    with KeepDir() as keep_dir:
-        keep_dir.chdir(folder)
-        subprocess.run(['yt-dlp', '-f bestvideo[ext=mp4]',
-                       '--restrict-filenames', url], check=True)
+    result = subprocess.run(['yt-dlp', '-f bestvideo[ext=mp4]',
+                             '--restrict-filenames', '--print', 'after_move:filepath', url],
+                            check=True, cwd=directory, stdout=subprocess.PIPE, text=True)
+    return Path(directory, result.stdout.strip().splitlines()[-1])
+
+
+def download_video_once(url: str, folder: str = 'background') -> bool:
+    """
+    Downloads a video like download_video, but only if the file previously downloaded
+    from the URL to the folder in this process no longer exists. Concurrent callers for
+    the same URL wait for the running download, other URLs download in parallel.
+
+    Args:
+        url (str): The URL of the video to download.
+        folder (str, optional): The name of the folder to save the video in. Defaults to 'background'.
+
+    Returns:
+        bool: True if the video was downloaded, False if it was already downloaded.
+    """
+    with _download_locks_lock:
+        lock = _download_locks.setdefault((url, folder), threading.Lock())
+
+    with lock:
+        downloaded = _downloaded.get((url, folder))
+        if downloaded is not None and downloaded.exists():
+            return False
+        _downloaded[(url, folder)] = download_video(url=url, folder=folder)
+        return True
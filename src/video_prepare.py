@@ -1,4 +1,4 @@
-import multiprocessing
+import functools
 import os
 import subprocess
 import random
@@ -7,8 +7,28 @@ from utils import *
 
 HOME = Path.cwd()
 
+# Constant quality NVENC encoding, -b:v 0 lifts the default average bitrate cap
+NVENC_ARGS = ["-c:v", "h264_nvenc", "-preset", "p4", "-rc", "vbr", "-cq", "23", "-b:v", "0"]
 
-def prepare_background(background_mp4: str, filename_mp3: str, filename_srt: str, output_filename: str, verbose: bool = False) -> str:
+
+@functools.lru_cache(maxsize=None)
+def nvenc_available() -> bool:
+    """
+    Checks once whether ffmpeg can encode with NVENC on this machine.
+
+    Returns:
+        bool: True if a test frame could be encoded with the NVENC settings used for the videos.
+    """
+    args = ["ffmpeg", "-hide_banner", "-loglevel", "error",
+            "-f", "lavfi", "-i", "color=s=256x256",
+            "-frames:v", "1", *NVENC_ARGS, "-f", "null", "-"]
+    try:
+        return subprocess.run(args, capture_output=True).returncode == 0
+    except OSError:
+        return False
+
+
+def prepare_background(background_mp4: str, filename_mp3: str, filename_srt: str, output_filename: str, verbose: bool = False, extra_audio: str = None, mix: float = 0.3) -> str:
     video_info = get_info(background_mp4, kind='video')
     video_duration = int(round(video_info.get('duration'), 0))
 
@@ -40,29 +60,49 @@ def prepare_background(background_mp4: str, filename_mp3: str, filename_srt: str
         srt_filename_formatted = str(srt_raw).replace("\\", "\\\\\\\\")
         srt_filename_formatted = r"C\:\\\\" + str(srt_filename_formatted)[4:]
 
+    video_filter = f"crop=ih/16*9:ih, scale=w=1080:h=1920:flags=lanczos, gblur=sigma=2, ass='{srt_filename_formatted}'"
+
+    if extra_audio:
+        # Mix the extra audio into the TTS audio within the same ffmpeg pass
+        inputs = ["-i", filename_mp3, "-i", extra_audio]
+        filters = [
+            "-filter_complex",
+            f"[0:v]{video_filter}[vout];"
+            f"[1:a]volume={1 - mix}[a0];"
+            f"[2:a]volume={mix}[a1];"
+            f"[a0][a1]amix=inputs=2:duration=first:normalize=0[aout]",
+            "-map", "[vout]",
+            "-map", "[aout]"]
+    else:
+        inputs = ["-i", filename_mp3]
+        filters = [
+            "-map", "0:v",
+            "-map", "1:a",
+            "-vf", video_filter]
+
+    if nvenc_available():
+        # Encode on the GPU, filters stay on the CPU as the ass filter needs system memory frames
+        encoder = NVENC_ARGS
+    else:
+        encoder = ["-c:v", "libx264", "-crf", "23"]
+
     args = [
         "ffmpeg",
         "-ss", str(ss),
         "-t", str(audio_duration),
         "-i", background_mp4,
-        "-i", filename_mp3,
-        "-map", "0:v",
-        "-map", "1:a",
-        "-vf", f"crop=ih/16*9:ih, scale=w=1080:h=1920:flags=lanczos, gblur=sigma=2, ass='{srt_filename_formatted}'",
-        "-c:v", "libx264",
-        "-crf", "23",
+        *inputs,
+        *filters,
+        *encoder,
         "-c:a", "aac",
         "-ac", "2",
         "-b:a", "192K",
         f"{outfile}",
-        "-y",
-        "-threads", f"{multiprocessing.cpu_count()}"]
+        "-y"]
 
     if verbose:
         rich_print('[i] FFMPEG Command:\n'+' '.join(args)+'\n', style='yellow')
 
-    with KeepDir() as keep_dir:
-        keep_dir.chdir(srt_path)
-        subprocess.run(args, check=True)
+    subprocess.run(args, check=True, cwd=srt_path)
 
     return outfile
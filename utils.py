@@ -1,4 +1,5 @@
 import datetime
+import functools
 import os
 from pathlib import Path
 import random
@@ -8,27 +9,13 @@ import ffmpeg
 from rich.console import Console
 
 import msg
-from src.logger import setup_logger
+from src.logger import KeepDir, setup_logger
 
 
 console = Console()
 logger = setup_logger()
 
 
-class KeepDir:
-    def __init__(self):
-        self.original_dir = os.getcwd()
-
-    def __enter__(self):
-        return self
-
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        os.chdir(self.original_dir)
-
-    def chdir(self, path):
-        os.chdir(path)
-
-
 def rich_print(text, style: str = ""):
     console.print(text, style=style)
 
@@ -55,8 +42,6 @@ def random_background(folder: str = "background") -> str:
 
 
 def get_info(filename: str, kind: str):
-    global probe
-
     try:
         probe = ffmpeg.probe(filename)
     except ffmpeg.Error as e:
@@ -65,7 +50,7 @@ def get_info(filename: str, kind: str):
         sys.exit(1)
 
     if kind == 'video':
-        global video_stream
+        video_stream = None
 
         # Extract
         for stream in probe['streams']:
@@ -80,7 +65,7 @@ def get_info(filename: str, kind: str):
         return {'width': width, 'height': height, 'duration': duration}
 
     elif kind == 'audio':
-        global audio_stream
+        audio_stream = None
 
         # Extract
         for stream in probe['streams']:
@@ -103,13 +88,14 @@ def convert_time(time_in_seconds):
     Returns:
         str: The time in the format "hh:mm:ss.mmm".
     """
-    hours = int(time_in_seconds // 3600)
-    minutes = int((time_in_seconds % 3600) // 60)
-    seconds = int(time_in_seconds % 60)
-    milliseconds = int((time_in_seconds - int(time_in_seconds)) * 1000)
+    milliseconds = int(time_in_seconds * 1000)
+    hours, milliseconds = divmod(milliseconds, 3_600_000)
+    minutes, milliseconds = divmod(milliseconds, 60_000)
+    seconds, milliseconds = divmod(milliseconds, 1000)
     return f"{hours:02d}:{minutes:02d}:{seconds:02d}.{milliseconds:03d}"
 
 
+@functools.lru_cache(maxsize=256)
 def rgb_to_bgr(rgb: str) -> str:
     """
     Converts a color from RGB to BGR.